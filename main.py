@@ -3,33 +3,80 @@ import argparse
 import logging
 import os
 import re
+import signal
+import stat
 import sys
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
 
+try:
+    # Optional: google-re2 compiles these simple patterns to a DFA (no backtracking)
+    import re2 as _fast_re
+except ImportError:
+    _fast_re = re
+
 from watchdog.events import (
     FileCreatedEvent,
     FileMovedEvent,
     FileModifiedEvent,
-    FileSystemEventHandler,
+    PatternMatchingEventHandler,
 )
-from watchdog.observers import Observer
+
+# Pin the native backend so we never silently fall back to polling
+if sys.platform.startswith("linux"):
+    from watchdog.observers.inotify import InotifyObserver as Observer
+elif sys.platform == "darwin":
+    from watchdog.observers.fsevents import FSEventsObserver as Observer
+else:
+    from watchdog.observers import Observer
 
 INBOX_HEADER = "## Inbox"
 SAVED_ARTICLES_HEADER = "### Saved Articles"
+_RSS_PREFIX = "Inbox/RSS_Feed/"  # vault-relative folder whose notes go under SAVED_ARTICLES_HEADER
 DAILY_FILENAME_FORMAT = "%Y-%m-%d"  # results in e.g. 2025-08-18.md
 MD_EXTS = {".md", ".markdown"}
-H1_RE = re.compile(r"^\s*#\s+(.+?)\s*$")
+INOTIFY_MAX_WATCHES = Path("/proc/sys/fs/inotify/max_user_watches")
+DEBOUNCE_MS = 300  # trailing-edge delay that coalesces bursts of events per path
+BATCH_FLUSH_MS = 250  # queued inserts are written to the daily note together after this
+BATCH_MAX = 50  # ...or as soon as this many are waiting
+H1_RE = _fast_re.compile(r"^\s*#\s+(.+?)\s*$")
+# Bytes twin of H1_RE for scanning the head of a file; [ \t] so a match never spans lines
+_H1_BYTES_RE = _fast_re.compile(rb"(?m)^[ \t]*#[ \t]+(.+?)[ \t\r]*$")
+H1_SCAN_BYTES = 4096  # H1s live near the top; read this much before falling back
+_INBOX_HEADER_BYTES = INBOX_HEADER.encode("utf-8")
+_LINK_BYTES_RE = _fast_re.compile(rb"\[[^\]]*\]\(([^)]+)\)")
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
 
+# Formatted dates for the current wall-clock second, so strftime runs at most
+# once per second no matter how many events arrive. Keyed by the epoch second
+# rather than the day so DST/TZ changes are still picked up promptly.
+_DATE_CACHE = {"second": -1, "ymd_dash": "", "ymd": ""}
+
+
+def _refresh_date_cache() -> dict:
+    second = int(time.time())
+    if second != _DATE_CACHE["second"]:
+        now = datetime.now()
+        _DATE_CACHE["ymd_dash"] = now.strftime(DAILY_FILENAME_FORMAT)
+        _DATE_CACHE["ymd"] = now.strftime("%Y%m%d")
+        _DATE_CACHE["second"] = second
+    return _DATE_CACHE
+
+
 def today_stamp() -> str:
     # Use local time; if you prefer a fixed TZ, set TZ env or use zoneinfo
-    return datetime.now().strftime(DAILY_FILENAME_FORMAT)
+    return _refresh_date_cache()["ymd_dash"]
+
+
+def _today_ymd() -> str:
+    # Compact form used in note filenames, e.g. 20250818
+    return _refresh_date_cache()["ymd"]
 
 
 def daily_note_path(daily_dir: Path) -> Path:
@@ -51,9 +98,17 @@ def ensure_daily_note(daily_dir: Path) -> Path:
     return p
 
 
-def _atomic_write(path: Path, content: str):
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(content, encoding="utf-8")
+def _atomic_write(path: Path, content: str | bytes):
+    # Plain os-level write + rename; mode 0o666 so the umask decides, as write_text did
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    tmp = f"{path}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
     os.replace(tmp, path)
 
 
@@ -65,11 +120,17 @@ def _is_note_from_today(path: Path) -> bool:
     """
     name = path.name
     # strip temp prefix like ".conform.6798351."
-    clean = re.sub(r"^\.conform\.\d+\.", "", name)
-    m = re.fullmatch(r"(?P<ymd>\d{8})\d{4}\.md", clean)
-    if not m:
-        return False
-    return m.group("ymd") == datetime.now().strftime("%Y%m%d")
+    if name.startswith(".conform."):
+        end = name.find(".", 9)
+        if end > 9 and name[9:end].isdigit():
+            name = name[end + 1 :]
+    # Fixed-width checks, cheapest first; most events fail on the length
+    return (
+        len(name) == 15
+        and name.endswith(".md")
+        and name[:8] == _today_ymd()
+        and name[:12].isdigit()
+    )
 
 
 def _header_level(line: str) -> int | None:
@@ -79,16 +140,146 @@ def _header_level(line: str) -> int | None:
     return len(s) - len(s.lstrip("#"))
 
 
-def _normalize_md_link_url(url: str, base_dir: Path) -> str:
+def _normalize_md_link_url(url: str, base_dir_str: str) -> str:
     # Ignore web links; they won’t match file paths anyway
     if url.startswith(("http://", "https://")):
         return url
-    p = Path(url)
-    if not p.is_absolute():
-        p = (base_dir / p).resolve()
+    # Canonical string only; no symlink resolution (and so no syscalls) needed for dedup
+    if url.startswith("/"):
+        return os.path.normpath(url)
+    return os.path.normpath(os.path.join(base_dir_str, url))
+
+
+def _find_header_line(data: bytes, header: bytes, start: int, end: int) -> int:
+    """
+    Offset of the first line in data[start:end] that reads exactly `header`
+    (surrounding whitespace ignored), or -1. `data` must end with a newline.
+    """
+    i = data.find(header, start, end)
+    while i >= 0:
+        line_start = data.rfind(b"\n", 0, i) + 1
+        line_end = data.find(b"\n", i)
+        if (
+            line_start >= start
+            and not data[line_start:i].strip()
+            and not data[i + len(header) : line_end].strip()
+        ):
+            return line_start
+        i = data.find(header, i + 1, end)
+    return -1
+
+
+def _next_header(data: bytes, start: int, end: int, max_level: int) -> int:
+    """
+    Offset of the first header line of level <= max_level in data[start:end], or `end`.
+    Like CommonMark ATX headings, up to three leading spaces are allowed.
+    `start` must be the start of a line (preceded by a newline).
+    """
+    pos = start
+    while True:
+        i = data.find(b"#", pos, end)
+        if i < 0:
+            return end
+        line_start = data.rfind(b"\n", 0, i) + 1
+        indent = i - line_start
+        if indent <= 3 and data[line_start:i] == b" " * indent:
+            j = i + 1
+            while data[j : j + 1] == b"#":
+                j += 1
+            if j - i <= max_level:
+                return line_start
+        # Not a header that ends the block; carry on from the next line
+        pos = data.find(b"\n", i) + 1
+
+
+def _is_blank_line(data: bytes, pos: int) -> bool:
+    # End of file counts as blank: nothing needs separating from the bullet
+    return pos >= len(data) or not data[pos : data.find(b"\n", pos)].strip()
+
+
+def _link_targets(data: bytes, start: int, end: int, base_dir_str: str) -> set[str]:
+    # Every link in the range counts, not just the first one on each line
+    return {
+        _normalize_md_link_url(
+            m.group(1).strip().decode("utf-8", "ignore"), base_dir_str
+        )
+        for m in _LINK_BYTES_RE.finditer(data, start, end)
+    }
+
+
+def _insert_link(
+    data: bytes, title: str, link_url: str, sub_header: str | None, base_dir_str: str
+) -> bytes | None:
+    """
+    Return `data` (which must end with a newline) with the bullet spliced in, or None if the
+    target is already linked in the chosen block. See add_link_under_inbox for the rules.
+    """
+    # 1) Locate or create '## Inbox'
+    inbox_idx = _find_header_line(data, _INBOX_HEADER_BYTES, 0, len(data))
+    if inbox_idx < 0:
+        data = (
+            (data.rstrip() + b"\n\n" if data.strip() else b"")
+            + _INBOX_HEADER_BYTES
+            + b"\n"
+        )
+        inbox_idx = len(data) - len(_INBOX_HEADER_BYTES) - 1
+
+    # Compute Inbox block: from after '## Inbox' until next header with level <= 2
+    inbox_start = data.find(b"\n", inbox_idx) + 1
+    inbox_end = _next_header(data, inbox_start, len(data), 2)
+
+    # 2) If a sub_header is requested, locate it inside the Inbox block. A missing
+    # sub-section is created right after '## Inbox' and spans the rest of the block.
+    block_start, block_end = inbox_start, inbox_end
+    sub_bytes = sub_header.encode("utf-8") if sub_header else b""
+    new_sub = False
+    if sub_header:
+        sub_level = _header_level(sub_header) or 3  # '### Saved Articles' -> 3
+        sub_idx = _find_header_line(data, sub_bytes, inbox_start, inbox_end)
+        if sub_idx < 0:
+            new_sub = True
+        else:
+            block_start = data.find(b"\n", sub_idx) + 1
+        block_end = _next_header(data, block_start, inbox_end, sub_level)
+
+    # 3) De-duplicate by normalized link target inside the chosen block
+    existing_targets = _link_targets(data, block_start, block_end, base_dir_str)
+
+    new_target = _normalize_md_link_url(link_url, base_dir_str)
+    if new_target in existing_targets:
+        return None  # already present in this block
+
+    bullet = f"- [{title}]({link_url})\n".encode("utf-8")
+    # Keep a blank line at the start of the chosen block for readability
+    lead = b"" if _is_blank_line(data, block_start) else b"\n"
+    if new_sub:
+        insert = lead + sub_bytes + b"\n" + bullet + b"\n"
     else:
-        p = p.resolve()
-    return p.as_posix()
+        insert = lead + bullet
+
+    return data[:block_start] + insert + data[block_start:]
+
+
+def add_links_under_inbox(
+    daily_note: Path, links: list[tuple[str, str, str | None]]
+) -> set[str]:
+    """
+    Apply several (title, link_url, sub_header) inserts with a single read and a single
+    write of daily_note. Each insert follows add_link_under_inbox; if every link is already
+    present the note is left untouched. Returns the normalized targets now under '## Inbox'.
+    """
+    data = daily_note.read_bytes()
+    if not data.endswith(b"\n"):
+        data += b"\n"
+    base_dir_str = str(daily_note.parent)
+    changed = False
+    for title, link_url, sub_header in links:
+        new_data = _insert_link(data, title, link_url, sub_header, base_dir_str)
+        if new_data is not None:
+            data, changed = new_data, True
+    if changed:
+        _atomic_write(daily_note, data.rstrip() + b"\n")
+    return _inbox_link_targets(data, base_dir_str)
 
 
 def add_link_under_inbox(
@@ -100,93 +291,63 @@ def add_link_under_inbox(
     the chosen block. Inbox ends only at the next header of level <= 2. The sub-section ends at the next
     header of level <= the sub-section level.
     """
-    text = daily_note.read_text(encoding="utf-8")
-    lines = text.splitlines()
+    add_links_under_inbox(daily_note, [(title, link_url, sub_header)])
 
-    # 1) Locate or create '## Inbox'
-    inbox_idx = None
-    for i, line in enumerate(lines):
-        if line.strip() == INBOX_HEADER:
-            inbox_idx = i
-            break
-    if inbox_idx is None:
-        lines += ["", INBOX_HEADER, ""]
-        inbox_idx = len(lines) - 2
 
-    # Compute Inbox block: from after '## Inbox' until next header with level <= 2
-    inbox_start = inbox_idx + 1
-    inbox_end = len(lines)
-    for i in range(inbox_start, len(lines)):
-        lvl = _header_level(lines[i])
-        if lvl is not None and lvl <= 2:
-            inbox_end = i
-            break
-
-    # 2) If a sub_header is requested, locate/create it inside the Inbox block
-    block_start, block_end = inbox_start, inbox_end
-    if sub_header:
-        # Determine the sub_header level (count '#')
-        sub_level = _header_level(sub_header) or 3  # '### Saved Articles' -> 3
+def inbox_index_path(daily_note: Path) -> Path:
+    # Hidden sidecar next to the daily note, e.g. .2025-08-18.md.inbox-index
+    return daily_note.with_name(f".{daily_note.name}.inbox-index")
 
-        # Find existing sub_header within the Inbox range
-        sub_idx = None
-        for i in range(inbox_start, inbox_end):
-            if lines[i].strip() == sub_header:
-                sub_idx = i
-                break
-
-        if sub_idx is None:
-            # Ensure a blank immediately after '## Inbox'
-            insert_at = inbox_start
-            if insert_at < len(lines) and lines[insert_at].strip() != "":
-                lines.insert(insert_at, "")
-                insert_at += 1
-                inbox_end += 1  # shift end since we inserted inside Inbox
-
-            # Insert the sub_header and a following blank
-            lines.insert(insert_at, sub_header)
-            lines.insert(insert_at + 1, "")
-            sub_idx = insert_at
-            inbox_end += 2  # account for the two inserted lines
-
-        # Sub-block runs until next header with level <= sub_level or end of Inbox block
-        block_start = sub_idx + 1
-        block_end = inbox_end
-        for i in range(block_start, inbox_end):
-            lvl = _header_level(lines[i])
-            if lvl is not None and lvl <= sub_level:
-                block_end = i
-                break
 
-    # 3) De-duplicate by normalized link target inside the chosen block
-    inbox_block = lines[block_start:block_end]
-    link_re = re.compile(r"\[[^\]]*\]\(([^)]+)\)")
-    existing_targets = set()
-    base_dir = daily_note.parent
-    for ln in inbox_block:
-        m = link_re.search(ln)
-        if m:
-            existing_targets.add(_normalize_md_link_url(m.group(1).strip(), base_dir))
+def _inbox_link_targets(data: bytes, base_dir_str: str) -> set[str]:
+    # Normalized targets of every link under '## Inbox', sub-sections included
+    if not data.endswith(b"\n"):
+        data += b"\n"
+    inbox_idx = _find_header_line(data, _INBOX_HEADER_BYTES, 0, len(data))
+    if inbox_idx < 0:
+        return set()
+    inbox_start = data.find(b"\n", inbox_idx) + 1
+    inbox_end = _next_header(data, inbox_start, len(data), 2)
+    return _link_targets(data, inbox_start, inbox_end, base_dir_str)
 
-    new_target = _normalize_md_link_url(link_url, base_dir)
-    if new_target in existing_targets:
-        return  # already present in this block
 
-    bullet = f"- [{title}]({link_url})"
+def _note_stamp(daily_note: Path) -> str:
+    # Identifies the exact note contents the index was written against
+    st = daily_note.stat()
+    return f"{st.st_mtime_ns} {st.st_size}"
 
-    # Keep a blank line at the start of the chosen block for readability
-    insert_line = block_start
-    if insert_line < len(lines) and lines[insert_line].strip() != "":
-        lines.insert(insert_line, "")
-        insert_line += 1
-        # Adjust block_end since we inserted within it
-        block_end += 1
-        if sub_header is None:
-            inbox_end += 1
 
-    lines.insert(insert_line, bullet)
-    new_text = "\n".join(lines).rstrip() + "\n"
-    _atomic_write(daily_note, new_text)
+def load_inbox_index(daily_note: Path) -> set[str]:
+    """
+    Return the normalized link targets already under '## Inbox' in daily_note, from its
+    sidecar index. The index's first line stamps the note's mtime and size as of our last
+    write; the index is rebuilt from the note when it is missing or the stamp no longer
+    matches (i.e. the note was edited by someone else since).
+    """
+    index = inbox_index_path(daily_note)
+    try:
+        stamp = _note_stamp(daily_note)
+    except FileNotFoundError:
+        return set()
+    # The index is only a cache: anything wrong with it just means rebuilding it
+    try:
+        lines = index.read_text(encoding="utf-8").splitlines()
+        if lines and lines[0] == stamp:
+            return set(lines[1:])
+    except (OSError, UnicodeDecodeError):
+        pass
+    targets = _inbox_link_targets(daily_note.read_bytes(), str(daily_note.parent))
+    try:
+        write_inbox_index(daily_note, targets)
+    except OSError as e:
+        logging.warning(f"[warn] could not write {index}: {e}")
+    return targets
+
+
+def write_inbox_index(daily_note: Path, targets: set[str]):
+    # Call right after writing daily_note so the stamp matches what is on disk
+    lines = [_note_stamp(daily_note), *sorted(targets)]
+    _atomic_write(inbox_index_path(daily_note), "".join(f"{ln}\n" for ln in lines))
 
 
 def derive_title_from_filename(path: Path) -> str:
@@ -200,99 +361,294 @@ def extract_h1_title(path: Path) -> str | None:
     Ignore blank '#', ignore '## ...' or deeper.
     """
     try:
+        with path.open("rb") as f:
+            head = f.read(H1_SCAN_BYTES)
+        # Only scan complete lines; a heading cut at the boundary is left to the fallback
+        at_eof = len(head) < H1_SCAN_BYTES
+        m = _H1_BYTES_RE.search(head, 0, len(head) if at_eof else head.rfind(b"\n") + 1)
+        if m:
+            return _clean_h1_title(m.group(1).decode("utf-8", "ignore"))
+        if at_eof:
+            return None
+        # Rare: no H1 near the top of a large file, stream the rest line by line
         with path.open("r", encoding="utf-8", errors="ignore") as f:
             for line in f:
                 m = H1_RE.match(line)
                 if m:
-                    title = m.group(1).strip().strip("#").strip()
-                    return title if title else None
+                    return _clean_h1_title(m.group(1))
     except Exception:
         # keep quiet or log if you added logging earlier
         return None
     return None
 
 
-def is_markdown_file(path: Path) -> bool:
-    return path.suffix.lower() in MD_EXTS
+def _clean_h1_title(raw: str) -> str | None:
+    title = raw.strip().strip("#").strip()
+    return title if title else None
 
 
-class NewFileHandler(FileSystemEventHandler):
+class NewFileHandler(PatternMatchingEventHandler):
     def __init__(self, watch_root: Path, daily_dir: Path, skip_daily_dir: bool):
-        super().__init__()
+        # Let watchdog drop directories and non-markdown paths before our callbacks run.
+        # '.conform.<n>.FOO.md' temp files still match '*.md'; their prefix is stripped later.
+        super().__init__(
+            patterns=[f"*{ext}" for ext in sorted(MD_EXTS)],
+            ignore_patterns=["*.tmp"],
+            ignore_directories=True,
+        )
         self.watch_root = watch_root.resolve()
         self.daily_dir = daily_dir.resolve()
         self.skip_daily_dir = skip_daily_dir
+        # Resolved, separator-terminated roots for cheap string containment checks
+        self._watch_root_str = os.path.join(str(self.watch_root), "")
+        self._daily_dir_str = os.path.join(str(self.daily_dir), "")
+        # Normalized link targets known to be in each daily note, backed by its
+        # sidecar index (see load_inbox_index); reset on date change
+        self._inserted: dict[Path, set[str]] = {}
+        # Full paths of today's linked notes, so their later edits are dropped in on_modified
+        self._handled_paths: set[str] = set()
+        # Debounce timers keyed by src_path; _work_lock serializes daily-note rewrites
+        self._pending: dict[str, threading.Timer] = {}
+        self._pending_lock = threading.Lock()
+        self._work_lock = threading.Lock()
+        # (title, link_url, sub_header) inserts waiting for the next batched write, guarded
+        # by _work_lock
+        self._pending_inserts: dict[Path, list[tuple[str, str, str | None]]] = {}
+        self._flush_timer: threading.Timer | None = None
+        # Per-day state is filled in by _roll_day(): up front via prewarm(), else on first event
+        self._day = ""
+        self._today_note_str = ""
+
+    def _schedule(self, path_str: str):
+        # (Re)arm the timer for this path so only the last event of a burst does work
+        timer = threading.Timer(DEBOUNCE_MS / 1000, self._run_pending, args=(path_str,))
+        timer.daemon = True
+        with self._pending_lock:
+            old = self._pending.get(path_str)
+            if old is not None:
+                old.cancel()
+            self._pending[path_str] = timer
+        timer.start()
+
+    def _run_pending(self, path_str: str):
+        with self._work_lock:
+            self._maybe_add(path_str)
+        # Only forget the timer once its work is done, so stop() can wait for it
+        with self._pending_lock:
+            if self._pending.get(path_str) is threading.current_thread():
+                del self._pending[path_str]
+
+    def stop(self):
+        # Run events still waiting out their debounce delay now instead of dropping them,
+        # then write everything queued. Call after the observer has stopped.
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for timer in pending.values():
+            timer.cancel()
+            timer.join()  # a timer that already fired finishes its own run first
+        with self._work_lock:
+            try:
+                for path_str in pending:
+                    try:
+                        self._maybe_add(path_str)
+                    except Exception:
+                        logging.exception(f"[err] could not handle {path_str}")
+            finally:
+                # Whatever happened above, don't lose inserts that are already queued
+                self._flush_locked()
+
+    def _queue_insert(
+        self, daily: Path, link: tuple[str, str, str | None], target: str
+    ):
+        # Caller holds _work_lock. Mark the target as known right away so repeat saves
+        # during the batch window are skipped too.
+        self._inserted.setdefault(daily, set()).add(target)
+        self._handled_paths.update(self._note_paths([target]))
+        batch = self._pending_inserts.setdefault(daily, [])
+        batch.append(link)
+        if len(batch) >= BATCH_MAX:
+            self._flush_locked()
+        elif self._flush_timer is None:
+            self._flush_timer = threading.Timer(
+                BATCH_FLUSH_MS / 1000, self._flush_inserts
+            )
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush_inserts(self):
+        with self._work_lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        # One read + one write per daily note for everything queued since the last flush
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        pending, self._pending_inserts = self._pending_inserts, {}
+        for daily, links in pending.items():
+            base_dir_str = str(daily.parent)
+            targets = [_normalize_md_link_url(url, base_dir_str) for _, url, _ in links]
+            try:
+                # Re-sync with what is actually in the note, so bullets removed by hand
+                # since the last flush are forgotten and can be linked again
+                on_disk = add_links_under_inbox(daily, links)
+                self._set_known(daily, on_disk)
+                write_inbox_index(daily, on_disk)
+            except Exception:
+                # Any failure, not just I/O (e.g. a link that can't be encoded): log it and
+                # forget this note's batch so the next save of those notes retries
+                logging.exception(f"[err] could not update {daily}")
+                self._inserted.get(daily, set()).difference_update(targets)
+                self._handled_paths.difference_update(self._note_paths(targets))
+
+    def _note_paths(self, targets) -> list[str]:
+        # Targets are vault-relative links normalized against daily_dir (see _maybe_add);
+        # map them back to the note path in the vault that produced them
+        n = len(self._daily_dir_str)
+        return [
+            self._watch_root_str + t[n:]
+            for t in targets
+            if t.startswith(self._daily_dir_str)
+        ]
+
+    def _set_known(self, daily: Path, targets: set[str]):
+        self._inserted[daily] = targets
+        self._handled_paths = set(self._note_paths(targets))
+
+    def prewarm(self):
+        """
+        Load today's dedup state before the observer starts, so the first event is already
+        a set lookup. Also drops sidecar indexes left behind by runs on earlier days.
+        """
+        with self._work_lock:
+            self._roll_day()
+
+    def _remove_stale_indexes(self, daily_path: Path):
+        # Past daily notes are never written again, so only today's index is kept. Scanning
+        # the directory also catches indexes from runs that didn't live through midnight.
+        today_index = inbox_index_path(daily_path).name
+        try:
+            entries = os.scandir(self.daily_dir)
+        except OSError:
+            return
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if (
+                    name.startswith(".")
+                    and name.endswith(".md.inbox-index")
+                    and name != today_index
+                    and entry.is_file(follow_symlinks=False)
+                ):
+                    try:
+                        os.unlink(entry.path)
+                    except OSError as e:
+                        # Someone else's file, or already gone: not worth failing over
+                        logging.warning(f"[warn] could not remove {entry.path}: {e}")
+
+    def _roll_day(self):
+        # Refresh per-day state when the local date changes
+        day = today_stamp()
+        if day != self._day:
+            # Write out anything queued for the old note before letting go of it
+            self._flush_locked()
+            daily_path = daily_note_path(self.daily_dir)
+            self._remove_stale_indexes(daily_path)
+            targets = load_inbox_index(daily_path)
+            today_note_str = os.path.realpath(daily_path)
+            self._inserted = {}
+            self._set_known(daily_path, targets)
+            self._today_note_str = today_note_str
+            # Only count the day as rolled once its state is fully in place, so a
+            # failure above is retried on the next event
+            self._day = day
 
     def _maybe_add(self, new_path_str: str):
-        # Guard: only act "today" and only on markdown files
+        # Guard: only act "today"; non-markdown paths never reach here (see patterns).
+        # The filename check is pure string work, so it runs before any syscall.
         p = Path(new_path_str)
-        if not p.exists() or not p.is_file():
+        if not _is_note_from_today(p):
             return
-        if not is_markdown_file(p):
+
+        # One stat for both "exists" and "is a regular file"
+        try:
+            st = os.stat(new_path_str)
+        except OSError:
+            return
+        if not stat.S_ISREG(st.st_mode):
             return
 
-        # Skip files inside the daily notes directory if requested
-        if self.skip_daily_dir and self._is_in_daily_dir(p):
+        # One realpath per event; the containment checks below are string prefix tests
+        abs_path = os.path.realpath(new_path_str)
+        # Ensure the file is inside the watch root
+        if not abs_path.startswith(self._watch_root_str):
             return
 
-        # Also don't link the daily note itself
-        if p.resolve() == daily_note_path(self.daily_dir).resolve():
+        # Skip files inside the daily notes directory if requested
+        if self.skip_daily_dir and abs_path.startswith(self._daily_dir_str):
             return
 
-        try:
-            # Ensure the file is inside the watch root
-            p.resolve().relative_to(self.watch_root)
-        except ValueError:
+        # Also don't link the daily note itself
+        self._roll_day()
+        if abs_path == self._today_note_str:
             return
 
-        if not _is_note_from_today(p):
+        # Links should be relative to daily note directory so they work in editors like Obsidian
+        vault_relative = abs_path[len(self._watch_root_str) :].replace(os.sep, "/")
+        # Drop a temp prefix like '.conform.6798351.' so the link points at the real note
+        idx = vault_relative.find(".conform.")
+        if idx >= 0:
+            end = vault_relative.find(".", idx + 9)
+            if end > idx + 9 and vault_relative[idx + 9 : end].isdigit():
+                vault_relative = vault_relative[:idx] + vault_relative[end + 1 :]
+
+        # Skip repeat saves of a note we've already linked today, before any file I/O
+        daily_path = daily_note_path(self.daily_dir)
+        new_target = _normalize_md_link_url(vault_relative, str(daily_path.parent))
+        if new_target in self._inserted.get(daily_path, ()):
             return
 
         h1_title = extract_h1_title(p)
         if not h1_title:
             return
 
-        # Target daily note for "now"
-        daily = ensure_daily_note(self.daily_dir)
-
-        # Links should be relative to daily note directory so they work in editors like Obsidian
-        p_resolved = p.resolve()
-        vault_relative = p_resolved.relative_to(self.watch_root).as_posix()
-        vault_relative = re.sub(r"\.conform\.\d+\.", "", vault_relative)
+        # Target daily note for "now"; one check per batch is enough
+        if daily_path not in self._pending_inserts:
+            ensure_daily_note(self.daily_dir)
         # title = derive_title_from_header(p)
 
         # Decide destination: RSS files go under '### Saved Articles' inside Inbox
-        rel_from_vault = p_resolved.relative_to(self.watch_root).as_posix()
-        is_rss = rel_from_vault.startswith("Inbox/RSS_Feed/")
+        is_rss = vault_relative.startswith(_RSS_PREFIX)
 
         sub_header = SAVED_ARTICLES_HEADER if is_rss else None
-        add_link_under_inbox(daily, h1_title, vault_relative, sub_header=sub_header)
-
-    def _is_in_daily_dir(self, p: Path) -> bool:
-        try:
-            p.resolve().relative_to(self.daily_dir)
-            return True
-        except ValueError:
-            return False
+        self._queue_insert(
+            daily_path, (h1_title, vault_relative, sub_header), new_target
+        )
 
-    # New file created
+    # New file created; a create followed by modifies collapses into one run
     def on_created(self, event: FileCreatedEvent):
-        if not event.is_directory:
-            self._maybe_add(event.src_path)
+        self._schedule(event.src_path)
 
     def on_modified(self, event: FileModifiedEvent):
-        if not event.is_directory:
-            self._maybe_add(event.src_path)
+        # Edits to a note that is already linked today need no work at all
+        if event.src_path in self._handled_paths:
+            return
+        self._schedule(event.src_path)
 
     # File moved into the tree
     def on_moved(self, event: FileMovedEvent):
         # If destination is within the watched tree, treat as new
-        dest = Path(event.dest_path)
-        try:
-            dest.resolve().relative_to(self.watch_root.resolve())
-            self._maybe_add(event.dest_path)
-        except ValueError:
-            pass
+        if os.path.realpath(event.dest_path).startswith(self._watch_root_str):
+            self._schedule(event.dest_path)
+
+
+def _log_inotify_limit():
+    # inotify needs one watch per directory; surface the ceiling for deep vaults
+    try:
+        limit = INOTIFY_MAX_WATCHES.read_text().strip()
+    except OSError:
+        return
+    logging.info(f"[ok] inotify max_user_watches={limit}")
 
 
 def main():
@@ -329,18 +685,25 @@ def main():
     handler = NewFileHandler(
         watch_root, daily_dir, skip_daily_dir=not args.include_daily_dir
     )
+    handler.prewarm()
     observer = Observer()
+    # A single recursive watch; daily_dir needs no watch of its own since we only
+    # ever write to it (events inside watch_root already cover it when nested)
     observer.schedule(handler, str(watch_root), recursive=True)
+    if sys.platform.startswith("linux"):
+        _log_inotify_limit()
     observer.start()
     logging.info(
         f"[ok] Watching {watch_root} -> daily notes in {daily_dir}. `systemctl --user stop obsidian-watcher.service` to stop."
     )
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        observer.stop()
+    # Sleep until SIGINT (Ctrl-C) or SIGTERM (`systemctl stop`) instead of polling
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    stop.wait()
+    observer.stop()
     observer.join()
+    handler.stop()
 
 
 if __name__ == "__main__":